@@ -1,20 +1,69 @@
+import functools
 import logging
-import time
-from typing import Iterable, List, Optional
+import re
+import threading
+from datetime import datetime
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
 
 import requests
-from bs4 import BeautifulSoup
+import requests_cache
 from dateutil import parser as date_parser
+from requests.adapters import HTTPAdapter
+from selectolax.lexbor import LexborHTMLParser, LexborNode
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
 
 from .review_utils import (
     Review,
     clean_text,
-    deduplicate_reviews,
-    filter_by_stars,
+    iter_new_reviews,
 )
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BASE_URL = "https://www.amazon.com/product-reviews/{asin}?pageNumber={page}"
+
+# f-string fast path for DEFAULT_BASE_URL; keep the two URLs identical.
+def _default_review_url(asin: str, page: int) -> str:
+    return f"https://www.amazon.com/product-reviews/{asin}?pageNumber={page}"
+
+# Seconds a cached review page stays fresh.
+CACHE_EXPIRE_AFTER = 86400
+
+# CSS selectors used on review pages, kept in one place so layout changes only
+# need to be patched here.
+REVIEW_CARD_SELECTOR = 'div[data-hook="review"]'
+NEXT_PAGE_SELECTOR = "li.a-last a"
+
+# Fields inside a review card, keyed by (tag, data-hook). A card is walked
+# once and the first node for each slot is kept, instead of running a
+# separate selector query per field.
+_HOOK_SLOTS: Dict[Tuple[str, str], str] = {
+    ("i", "review-star-rating"): "rating",
+    ("i", "cmps-review-star-rating"): "rating_alt",
+    ("a", "review-title"): "title",
+    ("span", "review-title"): "title_alt",
+    ("span", "review-body"): "body",
+    ("span", "avp-badge"): "verified",
+    ("span", "review-date"): "date",
+    ("span", "format-strip"): "variant",
+    ("span", "helpful-vote-statement"): "helpful",
+}
+
+# "Reviewed in the United States on March 15, 2024" -> "March 15, 2024"
+_REVIEW_DATE_PREFIX = re.compile(r"^Reviewed in .*? on ")
+# Date layouts Amazon uses after the prefix (US and UK/EU style).
+_REVIEW_DATE_FORMATS = ("%B %d, %Y", "%d %B %Y")
+
+# Leading vote count in "1,234 people found this helpful".
+_HELPFUL_NUM = re.compile(r"(\d[\d,]*)")
+
+def _first_span(node: Optional[LexborNode]) -> Optional[LexborNode]:
+    return node.css_first("span") if node is not None else None
+
+def _node_text(node: Optional[LexborNode]) -> Optional[str]:
+    return clean_text(node.text(deep=True)) if node is not None else None
+
 class AmazonReviewScraper:
     """
     Scrapes Amazon product reviews from the public product reviews pages.
@@ -34,14 +83,31 @@ class AmazonReviewScraper:
         allowed_stars: Iterable[int],
         review_type: str,
         variants_mode: str,
+        pool_maxsize: int = 64,
+        cache_name: Optional[str] = None,
     ) -> None:
-        self.base_url = base_url or "https://www.amazon.com/product-reviews/{asin}?pageNumber={page}"
+        self.base_url = base_url or DEFAULT_BASE_URL
+        # Resolve the URL builder once: the default template gets an f-string,
+        # custom templates fall back to str.format.
+        if self.base_url == DEFAULT_BASE_URL:
+            self._url_fn: Callable[[str, int], str] = _default_review_url
+        else:
+            template = self.base_url
+            self._url_fn = lambda asin, page: template.format(asin=asin, page=page)
         self.timeout = int(timeout)
         self.delay = float(delay)
         self.max_reviews_per_asin = int(max_reviews_per_asin)
         self.allowed_stars = sorted(set(int(s) for s in allowed_stars))
+        # None means every rating is allowed and cards need no star check.
+        self._allowed_stars_set: Optional[FrozenSet[int]] = (
+            frozenset(self.allowed_stars)
+            if self.allowed_stars and set(self.allowed_stars) != set(range(1, 6))
+            else None
+        )
         self.review_type = review_type
         self.variants_mode = variants_mode
+        # Set by stop(); checked between pages and interrupts the delay sleep.
+        self._stop_event = threading.Event()
 
         headers = {
             "User-Agent": user_agent
@@ -52,8 +118,33 @@ class AmazonReviewScraper:
             ),
             "Accept-Language": "en-US,en;q=0.9",
         }
-
-        self.session = requests.Session()
+        # Advertise every content coding urllib3 can decode here (br/zstd are
+        # only included when the optional decoders are installed).
+        headers.update(make_headers(accept_encoding=True))
+
+        # Amazon throttles with 429/503; back off and retry those instead of
+        # ending pagination for the ASIN on the first refusal.
+        retry = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET"],
+        )
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=int(pool_maxsize), max_retries=retry)
+
+        # Cache successful pages on disk so re-runs don't re-fetch unchanged
+        # pages; cache_name=None uses a plain, uncached session.
+        if cache_name:
+            self.session = requests_cache.CachedSession(
+                cache_name=cache_name,
+                backend="sqlite",
+                expire_after=CACHE_EXPIRE_AFTER,
+                allowable_codes=(200,),
+            )
+        else:
+            self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.session.headers.update(headers)
 
     def _build_url(self, asin: str, page: int) -> str:
@@ -62,10 +153,16 @@ class AmazonReviewScraper:
 
         The template can contain {asin} and {page} placeholders.
         """
-        url = self.base_url.format(asin=asin, page=page)
-        return url
+        return self._url_fn(asin, page)
+
+    def _fetch_page(self, asin: str, page: int) -> Tuple[Optional[bytes], bool]:
+        """
+        Fetch a review page and return the raw response body (None on error)
+        and whether it was served from the HTTP cache.
 
-    def _fetch_page(self, asin: str, page: int) -> Optional[str]:
+        The bytes are handed straight to the Lexbor parser (Amazon.com serves
+        UTF-8), which avoids decoding every page to a str first.
+        """
         url = self._build_url(asin, page)
         logger.debug("Requesting URL: %s", url)
         try:
@@ -77,8 +174,8 @@ class AmazonReviewScraper:
                     page,
                     resp.status_code,
                 )
-                return None
-            return resp.text
+                return None, False
+            return resp.content, getattr(resp, "from_cache", False)
         except requests.RequestException as exc:
             logger.warning(
                 "Request error for ASIN=%s page=%d: %s",
@@ -86,9 +183,11 @@ class AmazonReviewScraper:
                 page,
                 exc,
             )
-            return None
+            return None, False
 
-    def _parse_rating(self, rating_text: str) -> Optional[int]:
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _parse_rating(rating_text: str) -> Optional[int]:
         """
         Parse strings like '5.0 out of 5 stars' to an integer rating.
         """
@@ -103,77 +202,108 @@ class AmazonReviewScraper:
             logger.debug("Could not parse rating from text: %r", rating_text)
             return None
 
-    def _parse_helpful_votes(self, helpful_text: str) -> int:
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _parse_helpful_votes(helpful_text: str) -> int:
         """
         Parse strings like '12 people found this helpful' or 'One person found this helpful'.
         """
         if not helpful_text:
             return 0
-        helpful_text = helpful_text.strip().lower()
-        if "one person" in helpful_text:
+        match = _HELPFUL_NUM.search(helpful_text)
+        if match:
+            return int(match.group(1).replace(",", ""))
+        helpful_text = helpful_text.lstrip().lower()
+        if helpful_text.startswith("one ") or "one person" in helpful_text:
             return 1
-        digits = "".join(ch for ch in helpful_text if ch.isdigit())
-        if digits:
-            try:
-                return int(digits)
-            except ValueError:
-                return 0
         return 0
 
-    def _parse_date(self, date_text: str) -> Optional[str]:
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _parse_date(date_text: str) -> Optional[str]:
         """
         Parse flexible date strings to ISO format (YYYY-MM-DD).
+
+        Known Amazon layouts are tried with strptime first; dateutil is only
+        used as a fallback, in strict mode before fuzzy mode. Results are
+        cached since many reviews share a date.
         """
         if not date_text:
             return None
-        try:
-            dt = date_parser.parse(date_text, fuzzy=True)
-            return dt.date().isoformat()
-        except (ValueError, TypeError) as exc:
-            logger.debug("Could not parse date %r: %s", date_text, exc)
-            return None
+        date_str = _REVIEW_DATE_PREFIX.sub("", date_text, count=1)
+        for fmt in _REVIEW_DATE_FORMATS:
+            try:
+                return datetime.strptime(date_str, fmt).date().isoformat()
+            except ValueError:
+                continue
+        for fuzzy in (False, True):
+            try:
+                dt = date_parser.parse(date_str, fuzzy=fuzzy)
+                return dt.date().isoformat()
+            except (ValueError, TypeError, OverflowError) as exc:
+                error = exc
+        logger.debug("Could not parse date %r: %s", date_text, error)
+        return None
+
+    @staticmethod
+    def _collect_card_nodes(el: LexborNode) -> Dict[str, LexborNode]:
+        """
+        Walk a review card once and map each field slot to its first node.
+        """
+        found: Dict[str, LexborNode] = {}
+        for node in el.traverse():
+            tag = node.tag
+            attrs = node.attributes
+            hook = attrs.get("data-hook")
+            classes = (attrs.get("class") or "").split()
+
+            if hook is not None:
+                slot = _HOOK_SLOTS.get((tag, hook))
+                if slot == "variant" and "a-color-secondary" not in classes:
+                    slot = None
+                if slot is not None and slot not in found:
+                    found[slot] = node
+
+            if tag == "span" and "a-profile-name" in classes:
+                found.setdefault("reviewer", node)
+            elif tag == "a" and "a-size-mini" in classes:
+                # Sometimes the variant is inside a small bullet section
+                found.setdefault("variant_alt", node)
+        return found
 
-    def _parse_reviews_from_html(self, asin: str, html: str) -> List[Review]:
-        soup = BeautifulSoup(html, "html.parser")
-        review_elements = soup.select('div[data-hook="review"]')
+    def _parse_reviews_from_html(self, asin: str, tree: LexborHTMLParser) -> List[Review]:
+        review_elements = tree.css(REVIEW_CARD_SELECTOR)
         reviews: List[Review] = []
 
         for el in review_elements:
-            review_id = el.get("id") or ""
-            reviewer_el = el.select_one("span.a-profile-name")
-            reviewer_name = clean_text(reviewer_el.get_text()) if reviewer_el else None
-
-            rating_el = el.select_one('i[data-hook="review-star-rating"] span')
-            if rating_el is None:
-                rating_el = el.select_one('i[data-hook="cmps-review-star-rating"] span')
-            rating_text = clean_text(rating_el.get_text()) if rating_el else ""
+            found = self._collect_card_nodes(el)
+
+            # Rating first, so cards outside the star filter are dropped before
+            # any other field is extracted or a Review is built.
+            rating_el = _first_span(found.get("rating")) or _first_span(found.get("rating_alt"))
+            rating_text = _node_text(rating_el) or ""
             rating = self._parse_rating(rating_text) or 0
+            if self._allowed_stars_set is not None and rating not in self._allowed_stars_set:
+                continue
 
-            title_el = el.select_one('a[data-hook="review-title"] span')
-            if not title_el:
-                title_el = el.select_one('span[data-hook="review-title"] span')
-            title = clean_text(title_el.get_text()) if title_el else None
+            review_id = el.attributes.get("id") or ""
+            reviewer_name = _node_text(found.get("reviewer"))
 
-            body_el = el.select_one('span[data-hook="review-body"] span')
-            if not body_el:
-                body_el = el.select_one('span[data-hook="review-body"]')
-            review_text = clean_text(body_el.get_text()) if body_el else None
+            title_el = _first_span(found.get("title")) or _first_span(found.get("title_alt"))
+            title = _node_text(title_el)
 
-            verified_el = el.select_one('span[data-hook="avp-badge"]')
-            verified_purchase = bool(verified_el)
+            body_el = _first_span(found.get("body")) or found.get("body")
+            review_text = _node_text(body_el)
 
-            date_el = el.select_one('span[data-hook="review-date"]')
-            date_text = clean_text(date_el.get_text()) if date_el else ""
+            verified_purchase = "verified" in found
+
+            date_text = _node_text(found.get("date")) or ""
             date_iso = self._parse_date(date_text)
 
-            variant_el = el.select_one('span.a-color-secondary[data-hook="format-strip"]')
-            if not variant_el:
-                # Sometimes the variant is inside a small bullet section
-                variant_el = el.select_one('a.a-size-mini')
-            variant = clean_text(variant_el.get_text()) if variant_el else None
+            variant_el = found.get("variant") or found.get("variant_alt")
+            variant = _node_text(variant_el)
 
-            helpful_el = el.select_one('span[data-hook="helpful-vote-statement"]')
-            helpful_text = clean_text(helpful_el.get_text()) if helpful_el else ""
+            helpful_text = _node_text(found.get("helpful")) or ""
             helpful_votes = self._parse_helpful_votes(helpful_text)
 
             review = Review(
@@ -192,11 +322,25 @@ class AmazonReviewScraper:
 
         return reviews
 
-    def _has_next_page(self, html: str) -> bool:
-        soup = BeautifulSoup(html, "html.parser")
+    def _parse_page(self, asin: str, html: bytes) -> Tuple[List[Review], bool]:
+        """
+        Parse a review page once and return its reviews and whether another
+        page follows.
+        """
+        tree = LexborHTMLParser(html)
+        reviews = self._parse_reviews_from_html(asin, tree)
+        if not reviews and tree.css_first(REVIEW_CARD_SELECTOR) is None:
+            # No review cards at all (as opposed to all filtered by stars): last page.
+            return reviews, False
         # Amazon uses 'li.a-last a' for pagination; if there's no clickable link, we're at the last page
-        next_link = soup.select_one("li.a-last a")
-        return next_link is not None
+        return reviews, tree.css_first(NEXT_PAGE_SELECTOR) is not None
+
+    def stop(self) -> None:
+        """
+        Ask in-progress scrapes to stop. Each one returns what it has after
+        its current request instead of fetching further pages.
+        """
+        self._stop_event.set()
 
     def scrape_reviews_for_asin(self, asin: str) -> List[Review]:
         """
@@ -204,15 +348,22 @@ class AmazonReviewScraper:
         the configured limits or there are no more pages.
         """
         all_reviews: List[Review] = []
+        # Keys of reviews already kept for this ASIN, updated page by page so
+        # the accumulated list never has to be deduplicated again.
+        seen: Set[Tuple[str, str]] = set()
         page = 1
 
         while len(all_reviews) < self.max_reviews_per_asin:
-            html = self._fetch_page(asin, page)
+            if self._stop_event.is_set():
+                logger.info("Stopping pagination for ASIN=%s before page %d: scraper stopped.", asin, page)
+                break
+
+            html, from_cache = self._fetch_page(asin, page)
             if not html:
                 logger.info("Stopping pagination for ASIN=%s due to fetch error at page %d.", asin, page)
                 break
 
-            page_reviews = self._parse_reviews_from_html(asin, html)
+            page_reviews, has_next = self._parse_page(asin, html)
             logger.debug(
                 "Parsed %d reviews from ASIN=%s page=%d",
                 len(page_reviews),
@@ -220,7 +371,7 @@ class AmazonReviewScraper:
                 page,
             )
 
-            if not page_reviews:
+            if not page_reviews and not has_next:
                 logger.info(
                     "No reviews found on ASIN=%s page=%d. Assuming end of pages.",
                     asin,
@@ -228,8 +379,7 @@ class AmazonReviewScraper:
                 )
                 break
 
-            all_reviews.extend(page_reviews)
-            all_reviews = deduplicate_reviews(all_reviews)
+            all_reviews.extend(iter_new_reviews(page_reviews, seen))
 
             if len(all_reviews) >= self.max_reviews_per_asin:
                 logger.info(
@@ -239,15 +389,14 @@ class AmazonReviewScraper:
                 )
                 break
 
-            if not self._has_next_page(html):
+            if not has_next:
                 logger.info("No next page link for ASIN=%s after page %d", asin, page)
                 break
 
             page += 1
-            if self.delay > 0:
-                time.sleep(self.delay)
-
-        if self.allowed_stars and set(self.allowed_stars) != set(range(1, 6)):
-            all_reviews = filter_by_stars(all_reviews, self.allowed_stars)
+            # Only pace requests that actually reached Amazon; cached pages
+            # can be followed immediately.
+            if self.delay > 0 and not from_cache:
+                self._stop_event.wait(self.delay)
 
         return all_reviews
\ No newline at end of file
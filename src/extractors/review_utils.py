@@ -1,7 +1,7 @@
-from dataclasses import dataclass, asdict
-from typing import Iterable, List, Optional, Set, Tuple
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional, Set, Tuple
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Review:
     asin: str
     review_id: str
@@ -15,7 +15,19 @@ class Review:
     helpful_votes: int
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        # All fields are flat scalars, so a literal avoids asdict()'s recursive copy.
+        return {
+            "asin": self.asin,
+            "review_id": self.review_id,
+            "reviewer_name": self.reviewer_name,
+            "rating": self.rating,
+            "title": self.title,
+            "review_text": self.review_text,
+            "verified_purchase": self.verified_purchase,
+            "date": self.date,
+            "variant": self.variant,
+            "helpful_votes": self.helpful_votes,
+        }
 
 def clean_text(value: Optional[str]) -> Optional[str]:
     if value is None:
@@ -24,20 +36,14 @@ def clean_text(value: Optional[str]) -> Optional[str]:
     cleaned = " ".join(value.split())
     return cleaned or None
 
-def deduplicate_reviews(reviews: Iterable[Review]) -> List[Review]:
+def iter_new_reviews(reviews: Iterable[Review], seen: Set[Tuple[str, str]]) -> Iterator[Review]:
     """
-    Remove duplicate reviews based on (asin, review_id). Preserves first occurrence.
+    Yield reviews whose (asin, review_id) is not yet in `seen`, adding each
+    yielded key. Reusing `seen` across calls deduplicates incrementally.
     """
-    seen: Set[Tuple[str, str]] = set()
-    unique: List[Review] = []
     for r in reviews:
         key = (r.asin, r.review_id or "")
         if key in seen:
             continue
         seen.add(key)
-        unique.append(r)
-    return unique
-
-def filter_by_stars(reviews: Iterable[Review], allowed_stars: Iterable[int]) -> List[Review]:
-    allowed = set(int(s) for s in allowed_stars)
-    return [r for r in reviews if r.rating in allowed]
\ No newline at end of file
+        yield r
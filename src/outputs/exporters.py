@@ -1,7 +1,10 @@
 import json
 import logging
+import os
 from pathlib import Path
-from typing import Iterable, List
+from typing import BinaryIO, Iterable, Optional
+
+import orjson
 
 from extractors.review_utils import Review
 
@@ -11,20 +14,94 @@ def _ensure_parent_dir(path: Path) -> None:
     if not path.parent.exists():
         path.parent.mkdir(parents=True, exist_ok=True)
 
-def export_reviews_to_json(reviews: Iterable[Review], output_path: str, indent: int = 2) -> None:
-    path = Path(output_path)
-    _ensure_parent_dir(path)
+class ReviewStreamWriter:
+    """
+    Incrementally writes reviews to a JSON array or NDJSON file.
 
-    data: List[dict] = [r.to_dict() for r in reviews]
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=indent)
-    logger.info("JSON export complete: %s", path)
+    Reviews are written as they are passed to `write`, so callers never need
+    to hold the full result set in memory. They go to a temporary file next
+    to the output, which only replaces it on a clean `close`; an aborted run
+    leaves any previous output untouched.
+    """
 
-def export_reviews_to_ndjson(reviews: Iterable[Review], output_path: str) -> None:
-    path = Path(output_path)
-    _ensure_parent_dir(path)
+    def __init__(self, output_path: str, output_format: str = "json", indent: int = 2) -> None:
+        self.path = Path(output_path)
+        self.output_format = output_format
+        self.indent = indent
+        self.count = 0
+        self._tmp_path = self.path.with_name(self.path.name + ".part")
+        self._file: Optional[BinaryIO] = None
+
+    def _ensure_open(self) -> BinaryIO:
+        if self._file is None:
+            _ensure_parent_dir(self.path)
+            # A large buffer keeps write syscalls infrequent.
+            self._file = self._tmp_path.open("wb", buffering=1 << 20)
+            if self.output_format != "ndjson":
+                self._file.write(b"[")
+        return self._file
 
-    with path.open("w", encoding="utf-8") as f:
+    def _encode_json_item(self, review: Review) -> bytes:
+        # Match the layout json.dump(..., indent=indent) gives a list of dicts.
+        pad = " " * self.indent
+        item = json.dumps(review.to_dict(), ensure_ascii=False, indent=self.indent)
+        item = pad + item.replace("\n", "\n" + pad)
+        separator = "\n" if self.count == 0 else ",\n"
+        return (separator + item).encode("utf-8")
+
+    def write(self, reviews: Iterable[Review]) -> int:
+        """
+        Append reviews to the output file and return how many were written.
+        """
+        f = self._ensure_open()
+        written = 0
         for r in reviews:
-            f.write(json.dumps(r.to_dict(), ensure_ascii=False) + "\n")
-    logger.info("NDJSON export complete: %s", path)
\ No newline at end of file
+            if self.output_format == "ndjson":
+                # orjson serializes the Review dataclass directly to UTF-8 bytes.
+                f.write(orjson.dumps(r, option=orjson.OPT_APPEND_NEWLINE))
+            else:
+                f.write(self._encode_json_item(r))
+            self.count += 1
+            written += 1
+        return written
+
+    def close(self) -> None:
+        """
+        Finish the output and move it into place.
+        """
+        if self._file is None:
+            return
+        if self.output_format != "ndjson":
+            self._file.write(b"\n]" if self.count else b"]")
+        self._file.close()
+        self._file = None
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        """
+        Discard everything written so far without touching the output path.
+        """
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        self._tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "ReviewStreamWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+def export_reviews_to_json(reviews: Iterable[Review], output_path: str, indent: int = 2) -> None:
+    with ReviewStreamWriter(output_path, "json", indent=indent) as writer:
+        writer.write(reviews)
+    logger.info("JSON export complete: %s", writer.path)
+
+def export_reviews_to_ndjson(reviews: Iterable[Review], output_path: str) -> None:
+    with ReviewStreamWriter(output_path, "ndjson") as writer:
+        writer.write(reviews)
+    logger.info("NDJSON export complete: %s", writer.path)
@@ -3,7 +3,8 @@ import json
 import logging
 import os
 import sys
-from typing import List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Set, Tuple
 
 # Ensure the src directory is on sys.path when executed from repo root
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -12,9 +13,9 @@ if CURRENT_DIR not in sys.path:
     sys.path.insert(0, CURRENT_DIR)
 
 try:
-    from extractors.amazon_parser import AmazonReviewScraper
-    from extractors.review_utils import Review, deduplicate_reviews
-    from outputs.exporters import export_reviews_to_json, export_reviews_to_ndjson
+    from extractors.amazon_parser import DEFAULT_BASE_URL, AmazonReviewScraper
+    from extractors.review_utils import Review, iter_new_reviews
+    from outputs.exporters import ReviewStreamWriter
 except ImportError as exc:
     raise SystemExit(f"Failed to import internal modules: {exc}")
 
@@ -41,26 +42,73 @@ def configure_logging(settings: dict) -> None:
 def read_asins(path: str) -> List[str]:
     if not os.path.exists(path):
         raise FileNotFoundError(f"Input file not found: {path}")
-    asins: List[str] = []
     with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            asins.append(line)
-    return asins
+        text = f.read()
+    return [line for line in map(str.strip, text.splitlines()) if line and not line.startswith("#")]
+
+def _scrape_asin(
+    scraper: AmazonReviewScraper,
+    asin: str,
+    idx: int,
+    total: int,
+) -> List[Review]:
+    logger = logging.getLogger("runner")
+    logger.info("(%d/%d) Scraping reviews for ASIN %s", idx, total, asin)
+    try:
+        reviews = scraper.scrape_reviews_for_asin(asin)
+    except Exception as exc:
+        logger.exception("Error while scraping ASIN %s: %s", asin, exc)
+        return []
+    logger.info("Fetched %d reviews for ASIN %s", len(reviews), asin)
+    return reviews
+
+def scrape_all_asins(
+    scraper: AmazonReviewScraper,
+    asins: List[str],
+    concurrency: int,
+    on_reviews: Callable[[str, List[Review]], None],
+) -> None:
+    """
+    Scrape all ASINs on a thread pool, with at most `concurrency` in flight.
+
+    The scraper is built on a blocking requests.Session, which releases the GIL
+    while waiting on the network, so worker threads overlap those waits.
+    `on_reviews` is called on the calling thread with each ASIN's reviews as
+    soon as that ASIN finishes, so results can be streamed out instead of
+    accumulated. A failing ASIN is logged and reported with no reviews.
+
+    If the caller aborts (Ctrl+C, or `on_reviews` raises), queued ASINs are
+    cancelled and the scraper is stopped: in-flight ASINs finish only their
+    current HTTP request (bounded by the request timeout and retries), skip
+    any remaining delay and pages, and their partial results are discarded.
+    The call returns, re-raising the error, once those requests are done.
+    """
+    executor = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="scraper")
+    try:
+        futures = {
+            executor.submit(_scrape_asin, scraper, asin, idx, len(asins)): asin
+            for idx, asin in enumerate(asins, start=1)
+        }
+        for future in as_completed(futures):
+            on_reviews(futures[future], future.result())
+    except BaseException:
+        scraper.stop()
+        raise
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
 
 def run(
     settings_path: str,
     inputs_path: str,
     output_path: str | None = None,
+    use_cache: bool = True,
 ) -> None:
     settings = load_settings(settings_path)
     configure_logging(settings)
 
     logger = logging.getLogger("runner")
 
-    base_url = settings.get("base_url", "https://www.amazon.com/product-reviews/{asin}?pageNumber={page}")
+    base_url = settings.get("base_url", DEFAULT_BASE_URL)
     user_agent = settings.get("user_agent")
     max_reviews_per_asin = int(settings.get("max_reviews_per_asin", 1000))
     timeout = int(settings.get("request_timeout", 10))
@@ -69,6 +117,7 @@ def run(
     review_type = settings.get("review_type", "all")
     variants_mode = settings.get("variants_mode", "selected_only")
     daily_asin_limit = int(settings.get("daily_asin_limit", 1000))
+    concurrency = int(settings.get("concurrency", 8))
 
     output_cfg = settings.get("output", {})
     output_format = output_cfg.get("format", "json").lower()
@@ -102,32 +151,35 @@ def run(
         allowed_stars=stars,
         review_type=review_type,
         variants_mode=variants_mode,
+        # Each worker thread holds at most one connection at a time.
+        pool_maxsize=max(1, concurrency),
+        cache_name=os.path.join(REPO_ROOT, ".review_cache") if use_cache else None,
     )
 
-    all_reviews: List[Review] = []
-    for idx, asin in enumerate(asins, start=1):
-        logger.info("(%d/%d) Scraping reviews for ASIN %s", idx, len(asins), asin)
-        try:
-            reviews = scraper.scrape_reviews_for_asin(asin)
-            logger.info("Fetched %d reviews for ASIN %s", len(reviews), asin)
-            all_reviews.extend(reviews)
-        except Exception as exc:
-            logger.exception("Error while scraping ASIN %s: %s", asin, exc)
-
-    if not all_reviews:
-        logger.warning("No reviews collected. Exiting without writing output.")
+    # Reviews are written as each ASIN completes; only the dedup keys are kept
+    # in memory across the whole run.
+    seen: Set[Tuple[str, str]] = set()
+    logger.info("Streaming reviews to %s (format=%s)", output_path, output_format)
+    with ReviewStreamWriter(output_path, output_format, indent=output_indent) as writer:
+
+        def write_unique(asin: str, reviews: List[Review]) -> None:
+            unique = list(iter_new_reviews(reviews, seen))
+            if unique:
+                writer.write(unique)
+            if len(unique) < len(reviews):
+                logger.info(
+                    "Dropped %d duplicate reviews for ASIN %s",
+                    len(reviews) - len(unique),
+                    asin,
+                )
+
+        scrape_all_asins(scraper, asins, concurrency, write_unique)
+
+    if not writer.count:
+        logger.warning("No reviews collected. No output was written.")
         return
 
-    logger.info("Deduplicating %d reviews", len(all_reviews))
-    all_reviews = deduplicate_reviews(all_reviews)
-    logger.info("Total unique reviews after deduplication: %d", len(all_reviews))
-
-    logger.info("Writing %s reviews to %s (format=%s)", len(all_reviews), output_path, output_format)
-    if output_format == "ndjson":
-        export_reviews_to_ndjson(all_reviews, output_path)
-    else:
-        export_reviews_to_json(all_reviews, output_path, indent=output_indent)
-
+    logger.info("Wrote %d unique reviews to %s", writer.count, output_path)
     logger.info("Done.")
 
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
@@ -149,6 +201,11 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         default=None,
         help="Path to output file. Overrides the path in settings.json if provided.",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the on-disk HTTP cache and always fetch pages from Amazon.",
+    )
     return parser.parse_args(argv)
 
 if __name__ == "__main__":
@@ -157,4 +214,5 @@ if __name__ == "__main__":
         settings_path=args.settings,
         inputs_path=args.input,
         output_path=args.output,
+        use_cache=not args.no_cache,
     )
\ No newline at end of file